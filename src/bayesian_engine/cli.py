@@ -1,14 +1,78 @@
 """CLI entrypoint."""
 
 import argparse
+import json
+import mmap
+import os
+import sys
+from typing import Any
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None  # type: ignore[assignment]
 
-def main() -> None:
+from bayesian_engine.core import ValidationError, compute_consensus, validate_input_payload
+
+# Input files larger than this are parsed straight from a read-only mmap;
+# below it the mapping setup costs more than a plain read.
+_MMAP_MIN_BYTES = 64 * 1024
+
+
+def _load_input(input_path: str | None) -> Any:
+    """Parse the JSON payload from ``input_path``, or stdin when no path is given."""
+    # Read raw bytes: orjson parses UTF-8 bytes directly, and json.loads
+    # detects the encoding of bytes input itself.
+    if input_path:
+        with open(input_path, "rb") as f:
+            # orjson accepts a memoryview, so a large file is parsed from the
+            # page cache without copying it into a bytes object first.
+            if orjson is not None and os.fstat(f.fileno()).st_size > _MMAP_MIN_BYTES:
+                with (
+                    mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm,
+                    memoryview(mm) as view,
+                ):
+                    return orjson.loads(view)
+            data = f.read()
+    else:
+        data = sys.stdin.buffer.read()
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _dump_output(result: dict[str, Any], pretty: bool) -> str:
+    """Serialize the output report, indented only when ``pretty`` is set."""
+    if orjson is not None:
+        return orjson.dumps(result, option=orjson.OPT_INDENT_2 if pretty else 0).decode()
+    if pretty:
+        return json.dumps(result, indent=2)
+    return json.dumps(result, separators=(",", ":"))
+
+
+def main(argv: list[str] | None = None) -> None:
     parser = argparse.ArgumentParser(prog="bayesian-engine")
-    parser.add_argument("--input", help="Path to JSON input file")
+    parser.add_argument("--input", help="Path to JSON input file (defaults to stdin)")
     parser.add_argument("--dry-run", action="store_true", help="Compute output without DB writes")
-    parser.parse_args()
-    print("Bayesian Engine scaffold is ready.")
+    args = parser.parse_args(argv)
+
+    try:
+        payload = _load_input(args.input)
+    except OSError as exc:
+        parser.error(f"cannot read input: {exc}")
+    except ValueError as exc:
+        # Covers json.JSONDecodeError, orjson.JSONDecodeError (a subclass of it)
+        # and undecodable bytes.
+        parser.error(f"invalid JSON input: {exc}")
+
+    try:
+        validate_input_payload(payload)
+    except ValidationError as exc:
+        parser.error(f"invalid input: {exc}")
+
+    result = compute_consensus(payload["signals"])
+    # Indent for people at a terminal; emit compact JSON when piped to another program.
+    print(_dump_output(result, pretty=sys.stdout.isatty()))
 
 
 if __name__ == "__main__":
@@ -2,13 +2,112 @@
 
 from typing import Any
 
+SCHEMA_VERSION = "1.0.0"
+
+# Sentinel for absent keys; distinct from any JSON value, including null.
+_MISSING = object()
+
+# Below this many signals the array conversion costs more than the scalar loop.
+_NUMPY_MIN_SIGNALS = 256
+
+
+class ValidationError(ValueError):
+    """Raised when an input payload violates the input contract."""
+
+
+def _require(obj: dict[str, Any], key: str, path: str = "") -> Any:
+    """Return ``obj[key]`` or raise a ValidationError naming the missing field."""
+    if key not in obj:
+        raise ValidationError(f"{path}{key} is required")
+    return obj[key]
+
+
+def _check_probability_range(probabilities: list[int | float]) -> None:
+    """Raise for the first probability outside [0, 1] (NaN included)."""
+    if len(probabilities) >= _NUMPY_MIN_SIGNALS:
+        try:
+            # Imported here: only large batches use numpy, and a module-level
+            # import would slow down every CLI start.
+            import numpy as np
+
+            arr = np.asarray(probabilities, dtype=np.float64)
+        except (ImportError, OverflowError):
+            pass  # no numpy, or ints too large for float64; the scalar scan handles both
+        else:
+            bad = np.flatnonzero((arr < 0) | (arr > 1) | np.isnan(arr))
+            if bad.size:
+                idx = int(bad[0])
+                raise ValidationError(f"signals[{idx}].probability must be a number in [0, 1]")
+            return
+    for idx, probability in enumerate(probabilities):
+        if not 0 <= probability <= 1:
+            raise ValidationError(f"signals[{idx}].probability must be a number in [0, 1]")
+
+
+def validate_input_payload(payload: Any) -> None:
+    """
+    Validate a payload against the v1.0.0 input contract.
+
+    Raises:
+        ValidationError: If the payload is malformed
+    """
+    if not isinstance(payload, dict):
+        raise ValidationError("payload must be a JSON object")
+
+    schema_version = _require(payload, "schemaVersion")
+    if schema_version != SCHEMA_VERSION:
+        raise ValidationError(f"schemaVersion must be {SCHEMA_VERSION!r}, got {schema_version!r}")
+
+    market_id = _require(payload, "marketId")
+    if not isinstance(market_id, str) or not market_id:
+        raise ValidationError("marketId must be a non-empty string")
+
+    signals = _require(payload, "signals")
+    if not isinstance(signals, list):
+        raise ValidationError("signals must be an array")
+
+    # Hot loop: look fields up once via a sentinel instead of _require (which
+    # would also format the path string for every signal), bind globals to
+    # locals, and only build error messages on the failure branch. Exact
+    # type() identity checks short-circuit the common case; isinstance still
+    # decides for subclasses (and rejects bool, which subclasses int).
+    _type, _isinstance = type, isinstance
+    _dict, _str, _int, _float, _num = dict, str, int, float, (int, float)
+    _VE = ValidationError
+    missing = _MISSING
+    probabilities: list[int | float] = []
+    append = probabilities.append
+    for idx, signal in enumerate(signals):
+        if _type(signal) is not _dict and not _isinstance(signal, _dict):
+            raise _VE(f"signals[{idx}] must be an object")
+        source_id = signal.get("sourceId", missing)
+        if source_id is missing:
+            raise _VE(f"signals[{idx}].sourceId is required")
+        if (_type(source_id) is not _str and not _isinstance(source_id, _str)) or not source_id:
+            raise _VE(f"signals[{idx}].sourceId must be a non-empty string")
+        probability = signal.get("probability", missing)
+        if probability is missing:
+            raise _VE(f"signals[{idx}].probability is required")
+        probability_type = _type(probability)
+        if (
+            probability_type is not _float
+            and probability_type is not _int
+            and (_isinstance(probability, bool) or not _isinstance(probability, _num))
+        ):
+            raise _VE(f"signals[{idx}].probability must be a number in [0, 1]")
+        append(probability)
+
+    # Type checks stay per-signal above; the range check runs over all values at once.
+    _check_probability_range(probabilities)
+
 
 def compute_consensus(signals: list[dict[str, Any]]) -> dict[str, Any]:
     """Placeholder consensus implementation."""
     return {
-        "schemaVersion": "1.0.0",
+        "schemaVersion": SCHEMA_VERSION,
         "consensus": None,
         "confidence": None,
-        "sources": len(signals),
-        "diagnostics": {"status": "TODO"},
+        "sourceWeights": [],
+        "normalization": {},
+        "diagnostics": {"status": "TODO", "sources": len(signals)},
     }
@@ -1,8 +1,56 @@
 """Deterministic tie-break resolution for conflicting predictions."""
 
+import functools
+import heapq
+import math
+import sys
 from dataclasses import dataclass
-from typing import Dict, List, Tuple
-from collections import defaultdict
+from typing import TYPE_CHECKING, Callable, Dict, List, Literal, Optional, Tuple, overload
+
+# numpy is imported where it is used; at module level it would add its
+# import time to every caller, including those resolving a few agents.
+if TYPE_CHECKING:
+    import numpy as np
+    from numpy.typing import ArrayLike
+
+# Below this many agents the array conversion costs more than the Python loop.
+# Measured with a warm kernel, the compiled path breaks even at ~200 agents for
+# a few prediction groups and only clearly wins from ~500 with ~100 groups;
+# its first use also pays numba's import (and JIT unless cached).
+_COMPILED_MIN_AGENTS = 500
+
+# Integer buckets are used while their magnitude stays below this bound, so
+# that bucket / scale gives every bucket a distinct float representative.
+_MAX_EXACT_BUCKET = 2**51
+
+# Up to this many groups a full in-place sort beats heapq.nlargest(2, ...).
+_SORT_MAX_GROUPS = 16
+
+
+@functools.cache
+def _load_compiled_aggregate() -> Optional[Callable]:
+    """
+    Import the Numba kernel on first use, or return None without numba.
+    
+    Deferred so importing this module, or resolving small inputs, never pays
+    numpy's and numba's import and JIT cost.
+    """
+    try:
+        from bayesian_engine.tiebreak_kernel import aggregate
+    except ImportError:  # pragma: no cover - optional speedup
+        return None
+    return aggregate
+
+
+def _confidence_variance(agents: List["AgentSignal"]) -> float:
+    """Population variance of agent confidences (Welford's method)."""
+    mean = 0.0
+    m2 = 0.0
+    for n, agent in enumerate(agents, 1):
+        delta = agent.confidence - mean
+        mean += delta / n
+        m2 += delta * (agent.confidence - mean)
+    return m2 / len(agents)
 
 
 @dataclass(frozen=True)
@@ -16,7 +64,7 @@ class TieBreakDiagnostics:
     confidence_variance: float
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentSignal:
     """Single agent prediction with metadata."""
     
@@ -45,48 +93,269 @@ class DeterministicTieBreaker:
     
     def __init__(self, precision: int = 6):
         self.precision = precision
+        # Predictions are grouped by integer bucket floor(pred * scale + 0.5),
+        # which hashes and compares faster than rounded floats. Precisions with
+        # no finite float scale group by round() instead.
+        self._scale = 10**precision if 0 <= precision <= sys.float_info.max_10_exp else None
+    
+    def _quantize(self, agents: List[AgentSignal]) -> Tuple[List, Optional[int]]:
+        """
+        Return the grouping key of each agent's prediction and the key scale.
+        
+        Keys are integer buckets; when a prediction is too large to scale
+        (inf included), every key falls back to round(prediction, precision)
+        and the scale is None. Buckets beyond _MAX_EXACT_BUCKET are left to
+        the caller to check, once per group.
+        
+        Raises:
+            ValueError: If a prediction is NaN
+        """
+        scale = self._scale
+        if scale is not None:
+            floor = math.floor
+            try:
+                return [floor(a.prediction * scale + 0.5) for a in agents], scale
+            except OverflowError:
+                pass  # math.floor rejects inf, including an overflowed product
+            except ValueError:
+                raise ValueError("prediction must not be NaN") from None
+        return self._round_keys(agents), None
+    
+    def _round_keys(self, agents: List[AgentSignal]) -> List:
+        """Return round(prediction, precision) for each agent, the fallback grouping key."""
+        precision = self.precision
+        keys = [round(a.prediction, precision) for a in agents]
+        if any(key != key for key in keys):
+            raise ValueError("prediction must not be NaN")
+        return keys
+    
+    def _quantize_array(self, pred: "np.ndarray") -> Tuple["np.ndarray", Optional[int]]:
+        """Array equivalent of _quantize; integer buckets are returned as whole floats."""
+        import numpy as np
+
+        if np.isnan(pred).any():
+            raise ValueError("prediction must not be NaN")
+        if self._scale is not None:
+            with np.errstate(over="ignore"):
+                keys = np.floor(pred * float(self._scale) + 0.5)
+            if (np.abs(keys) < _MAX_EXACT_BUCKET).all():
+                return keys, self._scale
+        precision = self.precision
+        return np.array([round(p, precision) for p in pred.tolist()]), None
+    
+    @staticmethod
+    def _representative(key, scale: Optional[int]) -> float:
+        """
+        Return the value a group is reported under.
+        
+        Integer buckets map back to their prediction rounded to precision;
+        round() keys already are that value. Either way it depends only on
+        the bucket, never on which of its predictions came first.
+        """
+        return int(key) / scale if scale is not None else key
     
-    def _group_by_prediction(self, agents: List[AgentSignal]) -> Dict[float, List[AgentSignal]]:
-        """Group agents by their prediction value."""
-        groups = defaultdict(list)
-        for agent in agents:
-            # Round to precision for grouping floating point predictions
-            key = round(agent.prediction, self.precision)
-            groups[key].append(agent)
-        return dict(groups)
-    
-    def _calculate_group_metrics(self, group: List[AgentSignal]) -> Dict:
-        """Calculate aggregate metrics for a prediction group."""
-        total_weight = sum(a.weight for a in group)
-        avg_confidence = sum(a.confidence for a in group) / len(group)
-        max_reliability = max(a.reliability_score for a in group)
-        
-        return {
-            'agents': [a.agent_id for a in group],
-            'count': len(group),
-            'total_weight': total_weight,
-            'weight_density': total_weight / len(group),
-            'avg_confidence': avg_confidence,
-            'max_reliability': max_reliability,
+    def _aggregate(
+        self, agents: List[AgentSignal], keys: List, scale: Optional[int]
+    ) -> Tuple[Dict[float, Dict], float]:
+        """
+        Group agents by prediction; return per-group metrics and confidence variance.
+        
+        keys[i] is the quantized prediction of agents[i] (see _quantize).
+        """
+        # Group agents by prediction in a single pass, accumulating
+        # [representative, count, total_weight, total_confidence, max_reliability]
+        # per group instead of materializing member lists. The representative
+        # is computed once, when the group is created. The overall confidence
+        # variance is tracked in the same pass (Welford's method).
+        representative = self._representative
+        aggregates: Dict[float, list] = {}
+        n = 0
+        mean_conf = 0.0
+        m2 = 0.0
+        for agent, key in zip(agents, keys):
+            confidence = agent.confidence
+            n += 1
+            delta = confidence - mean_conf
+            mean_conf += delta / n
+            m2 += delta * (confidence - mean_conf)
+            
+            agg = aggregates.get(key)
+            if agg is None:
+                aggregates[key] = [
+                    representative(key, scale), 1, agent.weight, confidence, agent.reliability_score
+                ]
+            else:
+                agg[1] += 1
+                agg[2] += agent.weight
+                agg[3] += confidence
+                if agent.reliability_score > agg[4]:
+                    agg[4] = agent.reliability_score
+        
+        if scale is not None and not (
+            -_MAX_EXACT_BUCKET < min(aggregates) and max(aggregates) < _MAX_EXACT_BUCKET
+        ):
+            # Buckets this large may share a representative; group by round() instead
+            return self._aggregate(agents, self._round_keys(agents), None)
+        
+        group_metrics = {
+            pred: {
+                'count': count,
+                'total_weight': total_weight,
+                'weight_density': total_weight / count,
+                'avg_confidence': total_confidence / count,
+                'max_reliability': max_reliability,
+            }
+            for pred, count, total_weight, total_confidence, max_reliability
+            in aggregates.values()
         }
+        
+        # Population variance of confidence across all agents
+        return group_metrics, m2 / n
     
-    def resolve(self, agents: List[AgentSignal]) -> Tuple[float, TieBreakDiagnostics]:
+    def _aggregate_compiled(
+        self, agents: List[AgentSignal], kernel: Callable
+    ) -> Tuple[Dict[float, Dict], float]:
+        """
+        Numba-backed equivalent of _aggregate for large agent lists.
+        
+        Raises:
+            ValueError: If a prediction is NaN
+        """
+        import numpy as np  # loaded along with the kernel
+
+        n = len(agents)
+        keys, scale = self._quantize_array(
+            np.fromiter((a.prediction for a in agents), np.float64, n)
+        )
+        weight = np.fromiter((a.weight for a in agents), np.float64, n)
+        conf = np.fromiter((a.confidence for a in agents), np.float64, n)
+        rel = np.fromiter((a.reliability_score for a in agents), np.float64, n)
+        
+        first, count, total_w, total_c, max_r, variance = kernel(keys, weight, conf, rel)
+        group_metrics = {}
+        for g in range(len(first)):
+            group_count = int(count[g])
+            group_weight = float(total_w[g])
+            group_metrics[self._representative(keys[first[g]].item(), scale)] = {
+                'count': group_count,
+                'total_weight': group_weight,
+                'weight_density': group_weight / group_count,
+                'avg_confidence': float(total_c[g]) / group_count,
+                'max_reliability': float(max_r[g]),
+            }
+        return group_metrics, float(variance)
+    
+    def _resolve_unanimous(
+        self, agents: List[AgentSignal], pred: float
+    ) -> Tuple[float, TieBreakDiagnostics]:
+        """Resolve agents whose predictions all fall in the group reported as ``pred``."""
+        count = len(agents)
+        total_weight = sum(a.weight for a in agents)
+        group_metrics = {
+            pred: {
+                'count': count,
+                'total_weight': total_weight,
+                'weight_density': total_weight / count,
+                'avg_confidence': sum(a.confidence for a in agents) / count,
+                'max_reliability': max(a.reliability_score for a in agents),
+            }
+        }
+        return pred, self._build_diagnostics(
+            group_metrics, pred, "unanimous", _confidence_variance(agents)
+        )
+    
+    def _build_diagnostics(
+        self,
+        group_metrics: Dict[float, Dict],
+        winning_pred: float,
+        resolution_method: str,
+        variance: float,
+    ) -> TieBreakDiagnostics:
+        """Summarize group metrics into rounded diagnostics."""
+        return TieBreakDiagnostics(
+            method="prioritized_weight_density",
+            groups={
+                pred: {
+                    'count': data['count'],
+                    'weight_density': round(data['weight_density'], 4),
+                    'avg_confidence': round(data['avg_confidence'], 4),
+                    'max_reliability': round(data['max_reliability'], 4),
+                }
+                for pred, data in group_metrics.items()
+            },
+            selected_group=winning_pred,
+            tie_resolved_by=resolution_method,
+            confidence_variance=round(variance, 6)
+        )
+    
+    def _select(
+        self, group_metrics: Dict[float, Dict], variance: float, diagnostics: bool
+    ) -> Tuple[float, Optional[TieBreakDiagnostics]]:
+        """Pick the winning group and optionally build diagnostics."""
+        # Rank groups by resolution hierarchy. Sort keys are built once as
+        # plain tuples, so ordering is pure C tuple comparison with no key
+        # callback. Only the winner and runner-up matter: for many groups take
+        # the top two, for a few an in-place sort is cheaper than heapq's loop.
+        ranked = [
+            ((data['weight_density'], data['max_reliability'], -pred), pred)
+            for pred, data in group_metrics.items()
+        ]
+        if len(ranked) > _SORT_MAX_GROUPS:
+            ranked = heapq.nlargest(2, ranked)
+        else:
+            ranked.sort(reverse=True)
+        
+        winning_key, winning_pred = ranked[0]
+        if not diagnostics:
+            return winning_pred, None
+        
+        # Determine how tie was resolved
+        if len(ranked) == 1:
+            resolution_method = "unanimous"
+        elif winning_key[:2] == ranked[1][0][:2]:
+            resolution_method = "prediction_value_smallest"
+        else:
+            resolution_method = "weight_density"
+        
+        return winning_pred, self._build_diagnostics(
+            group_metrics, winning_pred, resolution_method, variance
+        )
+    
+    @overload
+    def resolve(
+        self, agents: List[AgentSignal], *, diagnostics: Literal[True] = ...
+    ) -> Tuple[float, TieBreakDiagnostics]: ...
+    
+    @overload
+    def resolve(
+        self, agents: List[AgentSignal], *, diagnostics: bool
+    ) -> Tuple[float, Optional[TieBreakDiagnostics]]: ...
+    
+    def resolve(
+        self, agents: List[AgentSignal], *, diagnostics: bool = True
+    ) -> Tuple[float, Optional[TieBreakDiagnostics]]:
         """
         Resolve tie between conflicting predictions.
         
         Args:
             agents: List of agent signals (may have different predictions)
+            diagnostics: Build diagnostics; pass False when only the winning
+                prediction is needed
             
         Returns:
-            Tuple of (winning_prediction, diagnostics)
+            Tuple of (winning_prediction, diagnostics); diagnostics is None
+            when not requested
             
         Raises:
-            ValueError: If agents list is empty
+            ValueError: If agents list is empty or a prediction is NaN
         """
         if not agents:
             raise ValueError("Cannot resolve tie with empty agent list")
         
         if len(agents) == 1:
+            self._quantize(agents)  # same prediction check as the grouped paths
+            if not diagnostics:
+                return agents[0].prediction, None
             return agents[0].prediction, TieBreakDiagnostics(
                 method="single_agent",
                 groups={agents[0].prediction: {"count": 1}},
@@ -95,58 +364,138 @@ class DeterministicTieBreaker:
                 confidence_variance=0.0
             )
         
-        # Group agents by prediction
-        groups = self._group_by_prediction(agents)
+        # Group agents by prediction and reduce each group
+        kernel = _load_compiled_aggregate() if len(agents) > _COMPILED_MIN_AGENTS else None
+        if kernel is not None:
+            aggregated = self._aggregate_compiled(agents, kernel)
+        else:
+            # Quantize each prediction once; the keys serve both the unanimity
+            # check and the grouping pass.
+            keys, scale = self._quantize(agents)
+            
+            # Fast path: a single group has nothing to rank
+            if keys.count(keys[0]) == len(keys) and (
+                scale is None or abs(keys[0]) < _MAX_EXACT_BUCKET
+            ):
+                pred = self._representative(keys[0], scale)
+                if not diagnostics:
+                    return pred, None
+                return self._resolve_unanimous(agents, pred)
+            aggregated = self._aggregate(agents, keys, scale)
+        group_metrics, variance = aggregated
         
-        # Calculate metrics for each group
-        group_metrics = {
-            pred: self._calculate_group_metrics(members)
-            for pred, members in groups.items()
-        }
+        return self._select(group_metrics, variance, diagnostics)
+    
+    @overload
+    def resolve_arrays(
+        self,
+        pred: "ArrayLike",
+        weight: "ArrayLike",
+        conf: "ArrayLike",
+        rel: "ArrayLike",
+        *,
+        diagnostics: Literal[True] = ...,
+    ) -> Tuple[float, TieBreakDiagnostics]: ...
+    
+    @overload
+    def resolve_arrays(
+        self,
+        pred: "ArrayLike",
+        weight: "ArrayLike",
+        conf: "ArrayLike",
+        rel: "ArrayLike",
+        *,
+        diagnostics: bool,
+    ) -> Tuple[float, Optional[TieBreakDiagnostics]]: ...
+    
+    def resolve_arrays(
+        self,
+        pred: "ArrayLike",
+        weight: "ArrayLike",
+        conf: "ArrayLike",
+        rel: "ArrayLike",
+        *,
+        diagnostics: bool = True,
+    ) -> Tuple[float, Optional[TieBreakDiagnostics]]:
+        """
+        Resolve tie from parallel arrays instead of AgentSignal objects.
         
-        # Calculate overall confidence variance for diagnostics
-        all_confidences = [a.confidence for a in agents]
-        mean_conf = sum(all_confidences) / len(all_confidences)
-        variance = sum((c - mean_conf) ** 2 for c in all_confidences) / len(all_confidences)
+        Element i of each array describes one agent. Grouping, ranking and
+        diagnostics follow resolve(); the confidence variance is computed
+        with np.var and may differ from resolve() in the last rounded digit.
         
-        # Sort groups by resolution hierarchy
-        sorted_groups = sorted(
-            group_metrics.items(),
-            key=lambda x: (x[1]['weight_density'], x[1]['max_reliability'], -x[0]),
-            reverse=True
-        )
+        Args:
+            pred: Predictions
+            weight: Agent weights
+            conf: Confidences, each in [0, 1]
+            rel: Reliability scores, each in [0, 1]
+            diagnostics: Build diagnostics; pass False when only the winning
+                prediction is needed
+            
+        Returns:
+            Tuple of (winning_prediction, diagnostics); diagnostics is None
+            when not requested
+            
+        Raises:
+            ImportError: If numpy is not installed
+            ValueError: If the arrays are empty, differ in length or hold
+                out-of-range values or NaN predictions
+        """
+        try:
+            import numpy as np
+        except ImportError:
+            raise ImportError("resolve_arrays requires numpy") from None
         
-        # Determine how tie was resolved
-        winning_pred = sorted_groups[0][0]
-        winning_metrics = sorted_groups[0][1]
+        pred = np.asarray(pred, dtype=np.float64)
+        weight = np.asarray(weight, dtype=np.float64)
+        conf = np.asarray(conf, dtype=np.float64)
+        rel = np.asarray(rel, dtype=np.float64)
+        if pred.ndim != 1 or not pred.shape == weight.shape == conf.shape == rel.shape:
+            raise ValueError("pred, weight, conf and rel must be 1-D arrays of equal length")
+        if not pred.size:
+            raise ValueError("Cannot resolve tie with empty agent list")
         
-        if len(sorted_groups) == 1:
-            resolution_method = "unanimous"
-        elif len(sorted_groups) > 1:
-            second = sorted_groups[1]
-            if (winning_metrics['weight_density'] == second[1]['weight_density'] and
-                winning_metrics['max_reliability'] == second[1]['max_reliability']):
-                resolution_method = "prediction_value_smallest"
-            else:
-                resolution_method = "weight_density"
-        else:
-            resolution_method = "unknown"
+        # Same range checks AgentSignal applies per instance
+        for name, values in (("confidence", conf), ("reliability_score", rel)):
+            bad = np.flatnonzero(~((values >= 0) & (values <= 1)))
+            if bad.size:
+                raise ValueError(f"{name} must be in [0,1], got {values[bad[0]]}")
+        keys, scale = self._quantize_array(pred)
         
-        # Build diagnostics
-        diagnostics = TieBreakDiagnostics(
-            method="prioritized_weight_density",
-            groups={
-                pred: {
-                    'count': data['count'],
-                    'weight_density': round(data['weight_density'], 4),
-                    'avg_confidence': round(data['avg_confidence'], 4),
-                    'max_reliability': round(data['max_reliability'], 4),
-                }
-                for pred, data in group_metrics.items()
-            },
-            selected_group=winning_pred,
-            tie_resolved_by=resolution_method,
-            confidence_variance=round(variance, 6)
-        )
+        if pred.size == 1:
+            winning_pred = float(pred[0])
+            if not diagnostics:
+                return winning_pred, None
+            return winning_pred, TieBreakDiagnostics(
+                method="single_agent",
+                groups={winning_pred: {"count": 1}},
+                selected_group=winning_pred,
+                tie_resolved_by="unanimous",
+                confidence_variance=0.0
+            )
+        
+        # Group by quantized prediction; np.unique sorts the buckets, so
+        # reorder them by first appearance to match resolve()
+        _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+        order = np.argsort(first)
+        n_groups = first.size
+        counts = np.bincount(inverse, minlength=n_groups)[order]
+        total_w = np.bincount(inverse, weights=weight, minlength=n_groups)[order]
+        total_c = np.bincount(inverse, weights=conf, minlength=n_groups)[order]
+        max_r = np.full(n_groups, -np.inf)
+        np.maximum.at(max_r, inverse, rel)
+        max_r = max_r[order]
+        
+        group_metrics = {}
+        for g, idx in enumerate(first[order]):
+            count = int(counts[g])
+            group_weight = float(total_w[g])
+            group_metrics[self._representative(keys[idx].item(), scale)] = {
+                'count': count,
+                'total_weight': group_weight,
+                'weight_density': group_weight / count,
+                'avg_confidence': float(total_c[g]) / count,
+                'max_reliability': float(max_r[g]),
+            }
         
-        return winning_pred, diagnostics
+        return self._select(group_metrics, float(np.var(conf)), diagnostics)
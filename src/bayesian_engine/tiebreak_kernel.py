@@ -0,0 +1,78 @@
+"""Numba-compiled aggregation kernel for tie-break resolution.
+
+Importing this module requires numpy and numba; ``tiebreak`` falls back to
+its pure Python loop when either is missing.
+"""
+
+import numpy as np
+from numba import njit
+
+
+@njit(cache=True)
+def aggregate(keys, weight, conf, rel):
+    """
+    Group agents by quantized prediction and reduce each group.
+
+    Mirrors the pure Python loop in ``DeterministicTieBreaker.resolve``:
+    ``keys`` holds the quantized predictions (checked by the caller), members
+    are accumulated in input order and groups are reported in order of first
+    appearance, so results match it exactly.
+
+    Returns:
+        Tuple of (first_index, count, total_weight, total_confidence,
+        max_reliability, confidence_variance); the per-group arrays are
+        indexed by group, first_index points at the group's first agent.
+    """
+    n = keys.shape[0]
+    # Stable sort keeps members of a bucket in input order
+    order = np.argsort(keys, kind="mergesort")
+
+    # First pass: count distinct buckets so outputs can be preallocated
+    k = 1
+    for j in range(1, n):
+        if keys[order[j]] != keys[order[j - 1]]:
+            k += 1
+
+    first = np.empty(k, np.int64)
+    count = np.empty(k, np.int64)
+    total_w = np.empty(k)
+    total_c = np.empty(k)
+    max_r = np.empty(k)
+
+    # Second pass: reduce each bucket
+    g = -1
+    prev = 0.0
+    for j in range(n):
+        i = order[j]
+        if g < 0 or keys[i] != prev:
+            g += 1
+            prev = keys[i]
+            first[g] = i
+            count[g] = 1
+            total_w[g] = weight[i]
+            total_c[g] = conf[i]
+            max_r[g] = rel[i]
+        else:
+            count[g] += 1
+            total_w[g] += weight[i]
+            total_c[g] += conf[i]
+            if rel[i] > max_r[g]:
+                max_r[g] = rel[i]
+
+    # Welford over the original order, as in the pure Python path
+    mean = 0.0
+    m2 = 0.0
+    for i in range(n):
+        delta = conf[i] - mean
+        mean += delta / (i + 1)
+        m2 += delta * (conf[i] - mean)
+
+    by_appearance = np.argsort(first)
+    return (
+        first[by_appearance],
+        count[by_appearance],
+        total_w[by_appearance],
+        total_c[by_appearance],
+        max_r[by_appearance],
+        m2 / n,
+    )
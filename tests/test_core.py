@@ -1,6 +1,91 @@
-from bayesian_engine.core import compute_consensus
+import subprocess
+import sys
+from typing import Any
+
+import pytest
+
+from bayesian_engine.core import ValidationError, compute_consensus, validate_input_payload
+
+
+def _payload(**overrides: Any) -> dict[str, Any]:
+    payload: dict[str, Any] = {
+        "schemaVersion": "1.0.0",
+        "marketId": "example-market",
+        "signals": [
+            {"sourceId": "alpha", "probability": 0.6},
+            {"sourceId": "beta", "probability": 1},
+        ],
+    }
+    payload.update(overrides)
+    return payload
 
 
 def test_compute_consensus_placeholder() -> None:
     result = compute_consensus([])
     assert result["schemaVersion"] == "1.0.0"
+
+
+def test_compute_consensus_output_contract() -> None:
+    result = compute_consensus([{"sourceId": "alpha", "probability": 0.6}])
+    assert set(result) == {
+        "schemaVersion",
+        "consensus",
+        "confidence",
+        "sourceWeights",
+        "normalization",
+        "diagnostics",
+    }
+    assert result["diagnostics"]["sources"] == 1
+
+    # Each report gets its own containers
+    result["sourceWeights"].append("mutated")
+    assert compute_consensus([])["sourceWeights"] == []
+
+
+def test_validate_accepts_valid_payload() -> None:
+    validate_input_payload(_payload())
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        [],
+        {"marketId": "m", "signals": []},
+        _payload(schemaVersion="2.0.0"),
+        _payload(marketId=""),
+        _payload(signals={}),
+        _payload(signals=({"sourceId": "alpha", "probability": 0.5},)),
+        _payload(signals=["alpha"]),
+        _payload(signals=[{"probability": 0.5}]),
+        _payload(signals=[{"sourceId": "", "probability": 0.5}]),
+        _payload(signals=[{"sourceId": "alpha"}]),
+        _payload(signals=[{"sourceId": "alpha", "probability": "0.5"}]),
+        _payload(signals=[{"sourceId": "alpha", "probability": True}]),
+        _payload(signals=[{"sourceId": "alpha", "probability": 1.5}]),
+        _payload(signals=[{"sourceId": "alpha", "probability": -0.1}]),
+        _payload(signals=[{"sourceId": "alpha", "probability": float("nan")}]),
+    ],
+)
+def test_validate_rejects_invalid_payload(payload: Any) -> None:
+    with pytest.raises(ValidationError):
+        validate_input_payload(payload)
+
+
+def test_validate_reports_signal_index() -> None:
+    payload = _payload(signals=[{"sourceId": "a", "probability": 0.1}, {"sourceId": "b"}])
+    with pytest.raises(ValidationError, match=r"signals\[1\]\.probability is required"):
+        validate_input_payload(payload)
+
+
+@pytest.mark.parametrize("bad_value", [1.5, -0.1, float("nan")])
+def test_validate_reports_first_out_of_range_probability_in_large_batch(bad_value: float) -> None:
+    signals = [{"sourceId": f"s{i}", "probability": 0.5} for i in range(1000)]
+    signals[700]["probability"] = bad_value
+    signals[900]["probability"] = bad_value
+    with pytest.raises(ValidationError, match=r"signals\[700\]\.probability"):
+        validate_input_payload(_payload(signals=signals))
+
+
+def test_numpy_not_imported_with_cli() -> None:
+    code = "import sys, bayesian_engine.cli\nassert 'numpy' not in sys.modules\n"
+    subprocess.run([sys.executable, "-c", code], check=True)
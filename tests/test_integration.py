@@ -1,2 +1,101 @@
+import io
+import json
+import mmap
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from bayesian_engine import cli
+
+SAMPLE_INPUT = Path(__file__).resolve().parents[1] / "examples" / "sample_input.json"
+
+
+def _stdin(monkeypatch: pytest.MonkeyPatch, text: str) -> None:
+    monkeypatch.setattr("sys.stdin", io.TextIOWrapper(io.BytesIO(text.encode("utf-8"))))
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def json_backend(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch) -> str:
+    if request.param == "stdlib":
+        monkeypatch.setattr(cli, "orjson", None)
+    elif cli.orjson is None:
+        pytest.skip("orjson not installed")
+    return request.param
+
+
 def test_cli_integration_placeholder() -> None:
     assert True
+
+
+def test_cli_reads_input_file(json_backend: str, capsys: pytest.CaptureFixture[str]) -> None:
+    cli.main(["--input", str(SAMPLE_INPUT)])
+    output = json.loads(capsys.readouterr().out)
+    assert output["schemaVersion"] == "1.0.0"
+
+
+def test_cli_reads_stdin(
+    json_backend: str, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    _stdin(monkeypatch, SAMPLE_INPUT.read_text(encoding="utf-8"))
+    cli.main([])
+    output = json.loads(capsys.readouterr().out)
+    assert output["schemaVersion"] == "1.0.0"
+
+
+def test_cli_rejects_malformed_json(monkeypatch: pytest.MonkeyPatch) -> None:
+    _stdin(monkeypatch, "{not json")
+    with pytest.raises(SystemExit) as excinfo:
+        cli.main([])
+    assert excinfo.value.code == 2
+
+
+def test_cli_rejects_invalid_payload(monkeypatch: pytest.MonkeyPatch) -> None:
+    _stdin(monkeypatch, json.dumps({"schemaVersion": "0.9.0", "marketId": "m", "signals": []}))
+    with pytest.raises(SystemExit) as excinfo:
+        cli.main([])
+    assert excinfo.value.code == 2
+
+
+def test_cli_output_indented_only_for_terminals(json_backend: str) -> None:
+    result = {"schemaVersion": "1.0.0", "diagnostics": {"status": "TODO"}}
+    assert "\n" not in cli._dump_output(result, pretty=False)
+    assert cli._dump_output(result, pretty=True).splitlines()[1].startswith("  ")
+    assert json.loads(cli._dump_output(result, pretty=False)) == result
+
+
+def test_cli_rejects_non_utf8_input(json_backend: str, tmp_path: Path) -> None:
+    bad_input = tmp_path / "input.json"
+    bad_input.write_bytes(b'{"marketId": "\xff"}')
+    with pytest.raises(SystemExit) as excinfo:
+        cli.main(["--input", str(bad_input)])
+    assert excinfo.value.code == 2
+
+
+def test_cli_reads_large_input_file(
+    json_backend: str,
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+    tmp_path: Path,
+) -> None:
+    signals = [{"sourceId": f"source-{i}", "probability": 0.5} for i in range(5000)]
+    large_input = tmp_path / "input.json"
+    large_input.write_text(
+        json.dumps({"schemaVersion": "1.0.0", "marketId": "m", "signals": signals}),
+        encoding="utf-8",
+    )
+    assert large_input.stat().st_size > cli._MMAP_MIN_BYTES
+
+    mapped = []
+    real_mmap = mmap.mmap
+
+    def recording_mmap(*args: Any, **kwargs: Any) -> mmap.mmap:
+        mapped.append(args)
+        return real_mmap(*args, **kwargs)
+
+    monkeypatch.setattr(cli.mmap, "mmap", recording_mmap)
+    cli.main(["--input", str(large_input)])
+    output = json.loads(capsys.readouterr().out)
+    assert output["diagnostics"]["sources"] == 5000
+    # Only orjson can parse straight from the mapping
+    assert len(mapped) == (1 if json_backend == "orjson" else 0)
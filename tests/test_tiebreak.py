@@ -1,6 +1,11 @@
 """Tests for deterministic tie-break resolution."""
 
+import random
+import subprocess
+import sys
+
 import pytest
+from bayesian_engine import tiebreak
 from bayesian_engine.tiebreak import (
     AgentSignal,
     DeterministicTieBreaker,
@@ -26,6 +31,12 @@ class TestAgentSignal:
     def test_invalid_reliability(self):
         with pytest.raises(ValueError, match="reliability_score must be in"):
             AgentSignal("agent_1", 0.5, 0.5, 1.0, 1.5)
+    
+    def test_slots_reject_unknown_attributes(self):
+        signal = AgentSignal("agent_1", 0.75, 0.8)
+        assert not hasattr(signal, "__dict__")
+        with pytest.raises(AttributeError):
+            signal.extra = 1
 
 
 class TestDeterministicTieBreaker:
@@ -60,6 +71,27 @@ class TestDeterministicTieBreaker:
         assert diag.tie_resolved_by == "unanimous"
         assert diag.groups[0.75]['count'] == 3
     
+    def test_unanimous_diagnostics_match_general_path(self):
+        """Unanimous groups still report full metrics and variance."""
+        agents = [
+            AgentSignal("a1", 0.75, 0.9, 0.9, 0.7),
+            AgentSignal("a2", 0.75, 0.7, 0.5, 0.6),
+            AgentSignal("a3", 0.7500001, 0.5, 0.4, 0.9),
+        ]
+        pred, diag = self.breaker.resolve(agents)
+        
+        assert pred == 0.75
+        assert diag.method == "prioritized_weight_density"
+        assert diag.groups == {
+            0.75: {
+                'count': 3,
+                'weight_density': 0.6,
+                'avg_confidence': 0.7,
+                'max_reliability': 0.9,
+            }
+        }
+        assert diag.confidence_variance == round(0.08 / 3, 6)
+    
     def test_weight_density_wins(self):
         """Higher weight density should win despite fewer agents."""
         # Group A: 2 agents, high weights -> high density
@@ -121,3 +153,224 @@ class TestDeterministicTieBreaker:
         assert 'count' in diag.groups[0.75]
         assert 'avg_confidence' in diag.groups[0.75]
         assert diag.confidence_variance > 0
+    
+    @pytest.mark.parametrize("agents", [
+        [AgentSignal("a1", 0.75, 0.8)],
+        [AgentSignal("a1", 0.75, 0.8), AgentSignal("a2", 0.75, 0.6)],
+        [
+            AgentSignal("a1", 0.75, 0.85, 0.9, 0.82),
+            AgentSignal("a2", 0.25, 0.70, 0.6, 0.65),
+        ],
+        [
+            AgentSignal("a1", 0.75, 0.8, 1.0, 0.9),
+            AgentSignal("a2", 0.25, 0.8, 1.0, 0.9),
+        ],
+    ])
+    def test_resolve_without_diagnostics(self, agents):
+        """Skipping diagnostics returns the same winner and no diagnostics."""
+        pred, _ = self.breaker.resolve(agents)
+        
+        assert self.breaker.resolve(agents, diagnostics=False) == (pred, None)
+    
+    def test_confidence_variance(self):
+        """Variance is the population variance of all agent confidences."""
+        agents = [
+            AgentSignal("a1", 0.75, 0.9),
+            AgentSignal("a2", 0.75, 0.7),
+            AgentSignal("a3", 0.25, 0.5),
+            AgentSignal("a4", 0.25, 0.3),
+        ]
+        _, diag = self.breaker.resolve(agents)
+        
+        # mean = 0.6; squared deviations = 0.09 + 0.01 + 0.01 + 0.09
+        assert diag.confidence_variance == 0.05
+    
+    def test_predictions_grouped_within_precision(self):
+        """Predictions equal at the configured precision share a group."""
+        breaker = DeterministicTieBreaker(precision=2)
+        agents = [
+            AgentSignal("a1", 0.751, 0.8, 1.0, 0.5),
+            AgentSignal("a2", 0.749, 0.8, 1.0, 0.5),
+            AgentSignal("a3", 0.25, 0.8, 0.5, 0.5),
+        ]
+        pred, diag = breaker.resolve(agents)
+        
+        # The group is reported under its prediction rounded to precision
+        assert pred == 0.75
+        assert diag.groups[0.75]['count'] == 2
+        assert diag.groups[0.25]['count'] == 1
+    
+    @pytest.mark.parametrize("n_copies", [1, tiebreak._COMPILED_MIN_AGENTS])
+    def test_result_independent_of_agent_order(self, n_copies):
+        """Permuting the agents changes neither the winner nor the diagnostics."""
+        agents = [
+            AgentSignal("a1", 0.3333333333, 0.8, 1.0, 0.5),
+            AgentSignal("a2", 0.3333334, 0.6, 1.0, 0.5),
+            AgentSignal("a3", 0.2, 0.7, 0.5, 0.5),
+        ] * n_copies
+        expected = self.breaker.resolve(agents)
+        assert expected[0] == 0.333333
+        
+        rng = random.Random(0)
+        for _ in range(5):
+            assert self.breaker.resolve(rng.sample(agents, len(agents))) == expected
+        
+        # Unanimous groups are reported the same way
+        pair = agents[:2]
+        assert self.breaker.resolve(pair) == self.breaker.resolve(pair[::-1])
+        assert self.breaker.resolve(pair)[0] == 0.333333
+    
+    @pytest.mark.parametrize("n_agents", [1, 3, tiebreak._COMPILED_MIN_AGENTS + 8])
+    def test_nan_prediction_raises(self, n_agents):
+        """NaN predictions fail the same way on every path."""
+        agents = [AgentSignal(f"a{i}", 0.5, 0.5) for i in range(n_agents - 1)]
+        agents.append(AgentSignal("bad", float("nan"), 0.5))
+        with pytest.raises(ValueError, match="prediction must not be NaN"):
+            self.breaker.resolve(agents)
+    
+    @pytest.mark.parametrize("big", [float("inf"), -float("inf"), 1e305])
+    @pytest.mark.parametrize("n_agents", [2, 3, tiebreak._COMPILED_MIN_AGENTS + 8])
+    def test_unscalable_prediction_grouped_by_round(self, big, n_agents):
+        """Predictions too large to scale still resolve, grouped by round()."""
+        agents = [AgentSignal("big", big, 0.5)]
+        agents += [AgentSignal(f"a{i}", 0.5, 0.5) for i in range(n_agents - 1)]
+        pred, diag = self.breaker.resolve(agents)
+        
+        assert pred == min(big, 0.5)
+        assert diag.groups[big]['count'] == 1
+        assert diag.groups[0.5]['count'] == n_agents - 1
+    
+    def test_precision_beyond_float_range(self):
+        agents = [AgentSignal("a1", 0.75, 0.8, 0.9), AgentSignal("a2", 0.25, 0.8, 0.6)]
+        pred, diag = DeterministicTieBreaker(precision=400).resolve(agents)
+        
+        assert pred == 0.75
+        assert diag.tie_resolved_by == "weight_density"
+    
+    def test_many_groups_pick_smallest_tied_prediction(self):
+        """Ranking is the same whether groups are sorted or heap-selected."""
+        for n_groups in (3, 40):
+            agents = [
+                AgentSignal(f"a{i}", round(0.99 - i * 0.01, 2), 0.8, 1.0, 0.9)
+                for i in range(n_groups)
+            ]
+            pred, diag = DeterministicTieBreaker().resolve(agents)
+            
+            assert pred == min(a.prediction for a in agents)
+            assert diag.tie_resolved_by == "prediction_value_smallest"
+
+
+class TestCompiledAggregation:
+    """The Numba kernel must reproduce the pure Python path exactly."""
+    
+    def test_matches_python_path(self, monkeypatch):
+        pytest.importorskip("numba")
+        
+        rng = random.Random(0)
+        agents = [
+            AgentSignal(
+                f"a{i}",
+                rng.choice([0.1, 0.25, 0.2500001, 0.5, 0.75, 0.9]),
+                rng.random(),
+                rng.uniform(0.1, 2.0),
+                rng.random(),
+            )
+            for i in range(tiebreak._COMPILED_MIN_AGENTS * 2)
+        ]
+        breaker = DeterministicTieBreaker()
+        compiled = breaker.resolve(agents)
+        
+        monkeypatch.setattr(tiebreak, "_load_compiled_aggregate", lambda: None)
+        assert breaker.resolve(agents) == compiled
+    
+    def test_kernel_not_imported_until_needed(self):
+        code = (
+            "import sys\n"
+            "from bayesian_engine.tiebreak import AgentSignal, DeterministicTieBreaker\n"
+            "agents = [AgentSignal('a', 0.1, 0.5), AgentSignal('b', 0.2, 0.5)]\n"
+            "DeterministicTieBreaker().resolve(agents)\n"
+            "assert 'bayesian_engine.tiebreak_kernel' not in sys.modules\n"
+            "assert 'numba' not in sys.modules\n"
+            "assert 'numpy' not in sys.modules\n"
+        )
+        subprocess.run([sys.executable, "-c", code], check=True)
+
+
+class TestResolveArrays:
+    """resolve_arrays must agree with resolve on the same agents."""
+    
+    def setup_method(self):
+        pytest.importorskip("numpy")
+        self.breaker = DeterministicTieBreaker()
+    
+    def _resolve_both(self, agents, **kwargs):
+        arrays = [
+            [a.prediction for a in agents],
+            [a.weight for a in agents],
+            [a.confidence for a in agents],
+            [a.reliability_score for a in agents],
+        ]
+        return (
+            self.breaker.resolve(agents, **kwargs),
+            self.breaker.resolve_arrays(*arrays, **kwargs),
+        )
+    
+    @pytest.mark.parametrize("agents", [
+        [AgentSignal("a1", 0.75, 0.8)],
+        [AgentSignal("a1", 0.75, 0.8, 0.9, 0.7), AgentSignal("a2", 0.75, 0.6, 0.8, 0.5)],
+        [
+            AgentSignal("a1", 0.75, 0.85, 0.9, 0.82),
+            AgentSignal("a2", 0.75, 0.80, 0.85, 0.78),
+            AgentSignal("a3", 0.25, 0.70, 0.6, 0.65),
+            AgentSignal("a4", 0.25, 0.65, 0.55, 0.70),
+            AgentSignal("a5", 0.25, 0.60, 0.50, 0.60),
+        ],
+        [AgentSignal("a1", 0.75, 0.8, 1.0, 0.5), AgentSignal("a2", 0.25, 0.8, 1.0, 0.9)],
+        [AgentSignal("a1", 0.75, 0.8, 1.0, 0.9), AgentSignal("a2", 0.25, 0.8, 1.0, 0.9)],
+        [
+            AgentSignal("a1", 0.3333334, 0.8),
+            AgentSignal("a2", 0.3333333333, 0.6),
+            AgentSignal("a3", 0.2, 0.7, 0.5),
+        ],
+    ])
+    def test_matches_resolve(self, agents):
+        expected, actual = self._resolve_both(agents)
+        assert actual == expected
+        
+        expected, actual = self._resolve_both(agents, diagnostics=False)
+        assert actual == expected
+    
+    def test_matches_resolve_on_many_groups(self):
+        rng = random.Random(1)
+        agents = [
+            AgentSignal(f"a{i}", rng.randint(0, 30) / 30, rng.random(), rng.random(), rng.random())
+            for i in range(300)
+        ]
+        (pred, diag), (array_pred, array_diag) = self._resolve_both(agents)
+        
+        assert array_pred == pred
+        assert array_diag.groups == diag.groups
+        assert array_diag.tie_resolved_by == diag.tie_resolved_by
+        assert array_diag.confidence_variance == pytest.approx(diag.confidence_variance, abs=1e-6)
+    
+    def test_empty_arrays_raise(self):
+        with pytest.raises(ValueError, match="empty agent list"):
+            self.breaker.resolve_arrays([], [], [], [])
+    
+    def test_mismatched_lengths_raise(self):
+        with pytest.raises(ValueError, match="equal length"):
+            self.breaker.resolve_arrays([0.5, 0.5], [1.0], [0.5, 0.5], [0.5, 0.5])
+    
+    def test_nan_prediction_raises(self):
+        with pytest.raises(ValueError, match="prediction must not be NaN"):
+            self.breaker.resolve_arrays([0.5, float("nan")], [1.0, 1.0], [0.5, 0.5], [0.5, 0.5])
+    
+    @pytest.mark.parametrize("big", [float("inf"), 1e305, 5e9])
+    def test_unscalable_prediction_matches_resolve(self, big):
+        agents = [AgentSignal("a1", big, 0.5), AgentSignal("a2", 0.5, 0.7, 0.8)]
+        expected, actual = self._resolve_both(agents)
+        assert actual == expected
+    
+    def test_invalid_confidence_raises(self):
+        with pytest.raises(ValueError, match="confidence must be in"):
+            self.breaker.resolve_arrays([0.5, 0.7], [1.0, 1.0], [0.5, 1.5], [0.5, 0.5])